@@ -0,0 +1,12 @@
+import sys
+
+# colorama is only needed when the output goes to a terminal; piped output stays plain text
+if sys.stdout.isatty():
+    from colorama import Fore, Style
+
+    RED = Fore.RED
+    GREEN = Fore.GREEN
+    YELLOW = Fore.YELLOW
+    RESET = Style.RESET_ALL
+else:
+    RED = GREEN = YELLOW = RESET = ""
@@ -1,7 +1,32 @@
-from colorama import Fore, Style
+from colors import RED, GREEN, RESET
 from store import Store
 from products import Product, LimitedProduct, NonStockedProduct, SecondHalfPrice, ThirdOneFree, PercentDiscount
 
+# the store menu never changes, so it is built once at import time
+_MENU_1 = f"{GREEN}1. {RESET}List all products in store"
+_MENU_2 = f"{GREEN}2. {RESET}Show total amount in store"
+_MENU_3 = f"{GREEN}3. {RESET}Make an order"
+_MENU_4 = f"{GREEN}4. {RESET}Quit"
+_MENU_BODY = "\n".join(["\n           Store Menu          ",
+                        "          ------------         ",
+                        _MENU_1,
+                        _MENU_2,
+                        _MENU_3,
+                        _MENU_4])
+
+# colored messages are constant, so they are built once instead of on every error
+_ERR_INVALID_PRODUCT = f"{RED}\nInvalid product number. Please try again.{RESET}"
+_ERR_INVALID_QUANTITY = f"{RED}\nPlease enter a valid quantity.{RESET}"
+_ERR_QUANTITY_NOT_POSITIVE = f"{RED}\nQuantity must be a positive integer.{RESET}"
+_ERR_NO_STOCK = f"{RED}\nNot enough stock available!{RESET}"
+_ERR_INVALID_CHOICE = f"{RED}Invalid choice, please try again.{RESET}"
+_MSG_TERMINATED = f"{RED}\nProgram terminated by user.{RESET}"
+
+# longer quantities are rejected before int(), which refuses digit strings of more than 4300 characters
+_MAX_QUANTITY_DIGITS = 9
+
+_index_prefixes = []
+
 
 def main():
     """
@@ -10,11 +35,12 @@ def main():
     :return: None
     """
     # setup initial stock of inventory
-    product_list = [Product("MacBook Air M2", price=1450, quantity=100),
-                    Product("Bose QuietComfort Earbuds", price=250, quantity=500),
-                    Product("Google Pixel 7", price=500, quantity=250),
-                    NonStockedProduct("Windows License", price=125),
-                    LimitedProduct("Shipping", price=10, quantity=250, maximum=1)
+    # the inventory is hardcoded and known to be valid, so the validation in __init__ is skipped
+    product_list = [Product._trusted("MacBook Air M2", price=1450, quantity=100),
+                    Product._trusted("Bose QuietComfort Earbuds", price=250, quantity=500),
+                    Product._trusted("Google Pixel 7", price=500, quantity=250),
+                    NonStockedProduct._trusted("Windows License", price=125),
+                    LimitedProduct._trusted("Shipping", price=10, quantity=250, maximum=1)
                     ]
 
     # Create promotion catalog
@@ -30,6 +56,20 @@ def main():
     start(best_buy)
 
 
+def _format_product_list(products):
+    """
+    Builds the numbered product listing as one string so it can be written with a single print call.
+    :param products: The products to be listed.
+    :type products: List[Product]
+    :return: The numbered listing, one product per line.
+    :rtype: str
+    """
+    # the "1. ", "2. ", ... prefixes are cached and only extended when a longer listing is needed
+    while len(_index_prefixes) < len(products):
+        _index_prefixes.append(f"{len(_index_prefixes) + 1}. ")
+    return "\n".join(prefix + product.show() for prefix, product in zip(_index_prefixes, products))
+
+
 def start(best_buy):
     """"
     Starts the interactive store menu where users can perform various actions such as:
@@ -42,98 +82,86 @@ def start(best_buy):
     :return: None
     """
     while True:
-        print("\n           Store Menu          ")
-        print("          ------------         ")
-        print(Fore.GREEN + "1. " + Style.RESET_ALL + "List all products in store")
-        print(Fore.GREEN + "2. " + Style.RESET_ALL + "Show total amount in store")
-        print(Fore.GREEN + "3. " + Style.RESET_ALL + "Make an order")
-        print(Fore.GREEN + "4. " + Style.RESET_ALL + "Quit")
+        print(_MENU_BODY)
 
         user_choice = input("\nEnter your choice: ")
 
         if user_choice == "1":
-            products = best_buy.get_all_products()
-            for index, product in enumerate(products, start=1):
-                promotion_info = f" - Promotion: {product.get_promotion().name}" if product.get_promotion() else ""
-
-                if isinstance(product, NonStockedProduct):
-                    print(f"{index}. {product.name} - Price: {product.price:.2f}€" + Fore.YELLOW + f"{promotion_info}" + Style.RESET_ALL)
-                elif isinstance(product, LimitedProduct):
-                    print(
-                        f"{index}. {product.name} - Price: {product.price:.2f}€ - Quantity: {product.quantity} - Max: {product.maximum}" + Fore.YELLOW + f"{promotion_info}" + Style.RESET_ALL)
-                else:
-                    print(
-                        f"{index}. {product.name} - Price: {product.price:.2f}€ - Quantity: {product.quantity}" + Fore.YELLOW + f"{promotion_info}" + Style.RESET_ALL)
-
+            print(_format_product_list(best_buy.get_all_products()))
 
         elif user_choice == "2":
             print(f"\nTotal quantity in store: {best_buy.get_total_quantity()}")
 
         elif user_choice == "3":
-            shopping_list = []
+            # maps each selected product to its accumulated quantity, so repeated picks become one order line
+            shopping_list = {}
+            # nothing is bought before the order is placed, so the catalog is rendered only once per order
+            products = best_buy.get_all_products()
+            catalog = "\nAvailable Products:\n" + _format_product_list(products)
+            print(catalog)
             while True:
-                print("\nAvailable Products:")
-                for index, product in enumerate(best_buy.get_all_products(), start=1):
-                    promotion_info = f" - Promotion: {product.get_promotion().name}" if product.get_promotion() else ""
-
-                    if isinstance(product, NonStockedProduct):
-                        print(f"{index}. {product.name} - Price: {product.price:.2f}€" + Fore.YELLOW + f"{promotion_info}" + Style.RESET_ALL)
-                    elif isinstance(product, LimitedProduct):
-                        print(
-                            f"{index}. {product.name} - Price: {product.price:.2f}€ - Maximum: {product.maximum} per order" + Fore.YELLOW + f"{promotion_info}" + Style.RESET_ALL)
-                    else:
-                        print(
-                            f"{index}. {product.name} - Price: {product.price:.2f}€ - Quantity: {product.quantity}" + Fore.YELLOW + f"{promotion_info}" + Style.RESET_ALL)
-
-                product_choice = input("\nWhen you want to finish order, enter empty text.\nWhich product # do you want? ")
+                product_choice = input("\nWhen you want to finish order, enter empty text.\n"
+                                       "Enter the product # and the amount together (e.g. '1 2') to skip the amount prompt.\n"
+                                       "Enter '?' to show the available products again.\n"
+                                       "Which product # do you want? ")
 
                 if not product_choice:
                     break
 
-                try:
-                    if product_choice == "0":
-                        raise ValueError(Fore.RED + "\nInvalid product number. Please try again." + Style.RESET_ALL)
-                    product_index = int(product_choice) - 1
-                    product = best_buy.get_all_products()[product_index]
-                except (ValueError, IndexError):
-                    print(Fore.RED + "\nInvalid product number. Please try again." + Style.RESET_ALL)
+                if product_choice.strip() == "?":
+                    print(catalog)
+                    continue
+
+                # "<product #> <amount>" answers both prompts with one line
+                parts = product_choice.split()
+                if len(parts) == 2:
+                    product_choice, quantity = parts
+                else:
+                    product_choice, quantity = product_choice.strip(), None
+
+                # check the input up front instead of letting int() raise on typos or overlong numbers
+                if (not product_choice.isdecimal() or len(product_choice) > len(str(len(products)))
+                        or not 0 < int(product_choice) <= len(products)):
+                    print(_ERR_INVALID_PRODUCT)
                     continue
+                product = products[int(product_choice) - 1]
+
+                if quantity is None:
+                    quantity = input(f"\nWhat amount do you want for {product.name}? ").strip()
 
-                quantity = input(f"\nWhat amount do you want for {product.name}? ")
-
-                try:
-                    quantity = int(quantity)
-                    if quantity <= 0:
-                        print(Fore.RED + "\nQuantity must be a positive integer." + Style.RESET_ALL)
-                        continue
-                    if isinstance(product, LimitedProduct) and quantity > product.maximum:
-                        print(Fore.RED + f"\nYou can only purchase a maximum of {product.maximum} units of {product.name}." + Style.RESET_ALL)
-                        continue
-                except ValueError:
-                    print(Fore.RED + "\nPlease enter a valid quantity." + Style.RESET_ALL)
+                if not quantity.isdecimal() or len(quantity) > _MAX_QUANTITY_DIGITS:
+                    print(_ERR_INVALID_QUANTITY)
+                    continue
+                quantity = int(quantity)
+                if quantity <= 0:
+                    print(_ERR_QUANTITY_NOT_POSITIVE)
+                    continue
+                total_quantity = shopping_list.get(product, 0) + quantity
+                if product.KIND == "LIMITED" and total_quantity > product.maximum:
+                    print(f"{RED}\nYou can only purchase a maximum of {product.maximum} units of {product.name}.{RESET}")
                     continue
 
-                if not isinstance(product, NonStockedProduct) and quantity > product.quantity:
-                    print(Fore.RED + "\nNot enough stock available!" + Style.RESET_ALL)
-                    print(Fore.RED + f"Currently, there are {product.quantity} units available for {product.name}." + Style.RESET_ALL)
+                if product.KIND != "NON_STOCKED" and total_quantity > product.quantity:
+                    print(_ERR_NO_STOCK)
+                    print(f"{RED}Currently, there are {product.quantity} units available for {product.name}.{RESET}")
                     continue
 
-                shopping_list.append((product, quantity))
+                shopping_list[product] = total_quantity
                 print(f"\nProduct added to list: {product.name} (x{quantity})")
 
-            total_price = best_buy.order(shopping_list)
-            print(f"\nTotal price of the order: " + Fore.GREEN + f"{total_price:.2f}€" + Style.RESET_ALL)
+            total_price = best_buy.order(list(shopping_list.items()))
+            print(f"\nTotal price of the order: {GREEN}{total_price:.2f}€{RESET}")
 
         elif user_choice == "4":
             print("\nBye!")
             return
 
         else:
-            print(Fore.RED + "Invalid choice, please try again." + Style.RESET_ALL)
+            print(_ERR_INVALID_CHOICE)
 
 
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        print(Fore.RED + "\nProgram terminated by user." + Style.RESET_ALL)
\ No newline at end of file
+        print(_MSG_TERMINATED)
\ No newline at end of file
@@ -1,5 +1,57 @@
-from colorama import Fore, Style
-from abc import ABC, abstractmethod
+from colors import YELLOW, RESET
+from fractions import Fraction
+import sys
+
+# promotion codes of the built-in promotions, see Promotion.PROMO_CODE
+SECOND_HALF_PRICE = 1
+THIRD_ONE_FREE = 2
+PERCENT_DISCOUNT = 3
+
+
+# bumped by set_quantity, activate, deactivate and Store.order,
+# so stores can tell when their cached totals are out of date
+_state_version = 0
+
+
+def state_version() -> int:
+    """
+    Returns a counter that changes whenever products are restocked, activated, deactivated or ordered.
+    :return: The current state version.
+    :rtype: int
+    """
+    return _state_version
+
+
+def note_stock_change():
+    """
+    Marks the cached totals of every store as out of date.
+    :return: None
+    """
+    global _state_version
+    _state_version += 1
+
+
+def _intern(name):
+    """
+    Interns a name so equal names share one string object.
+    Only exact str instances can be interned; subclasses of str are returned unchanged.
+    :param name: The name to intern.
+    :type name: str
+    :return: The interned name.
+    :rtype: str
+    """
+    return sys.intern(name) if type(name) is str else name
+
+
+def _promo_suffix(name):
+    """
+    Builds the highlighted promotion suffix shown after a product.
+    :param name: The name of the promotion.
+    :type name: str
+    :return: The suffix, e.g. " - Promotion: 30% off!" in yellow.
+    :rtype: str
+    """
+    return _intern(YELLOW + f" - Promotion: {name}" + RESET)
 
 
 class Product:
@@ -11,8 +63,25 @@ class Product:
         quantity (int): The available stock quantity (must be non-negative).
         active (bool): Indicates whether the product is available for sale.
         promotion (Promotion): Optional promotion applied to the product.
+        KIND (str): Class-level tag identifying the kind of product.
     """
 
+    KIND = "STANDARD"
+
+    # fixed attribute layout instead of a per-instance __dict__; __weakref__ keeps products weak-referenceable
+    __slots__ = ("name", "_price_cents", "_display_price", "quantity", "active",
+                 "_promotion", "_apply_promo", "_price_line", "_promo_suffix", "__weakref__")
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Gives subclasses that override _quantity_error or _remove_stock a buy method that calls them,
+        since Product.buy inlines the checks and the stock update of Product.
+        """
+        super().__init_subclass__(**kwargs)
+        if "buy" not in cls.__dict__ and (cls._quantity_error is not Product._quantity_error
+                                          or cls._remove_stock is not Product._remove_stock):
+            cls.buy = Product._buy_with_hooks
+
     def __init__(self, name: str, price: float, quantity: int):
         """
         Initializes a new Product instance.
@@ -32,11 +101,64 @@ class Product:
         if not isinstance(quantity, int) or quantity < 0:
             raise ValueError("Invalid quantity: quantity should be a non-negative integer")
 
-        self.name = name
+        self._setup(name, price, quantity)
+
+    def _setup(self, name, price, quantity):
+        """
+        Sets the initial attributes of the product without validating them.
+        :param name: The name of the product.
+        :type name: str
+        :param price: The price of the product.
+        :type price: float
+        :param quantity: The stock quantity of the product.
+        :type quantity: int
+        """
+        # interned, so products with the same name share one string object
+        self.name = _intern(name)
         self.price = float(price)
         self.quantity = quantity
         self.active = True
-        self.promotion = None
+        self._promotion = None
+        self._apply_promo = None
+        self._price_line = _cents_plain
+        self._promo_suffix = ""
+
+    @classmethod
+    def _trusted(cls, name, price, quantity):
+        """
+        Creates a product without validating the arguments.
+        Only meant for internal callers that pass known-good data, such as the hardcoded inventory.
+        :param name: The name of the product.
+        :type name: str
+        :param price: The price of the product.
+        :type price: float
+        :param quantity: The stock quantity of the product.
+        :type quantity: int
+        :return: The new product.
+        :rtype: Product
+        """
+        product = cls.__new__(cls)
+        product._setup(name, price, quantity)
+        return product
+
+    @property
+    def price(self) -> float:
+        """
+        Returns the price of the product. It is stored internally as integer cents.
+        :return: Price of the product.
+        :rtype: float
+        """
+        return self._price_cents / 100
+
+    @price.setter
+    def price(self, price):
+        """
+        Sets the price of the product in integer cents and refreshes its cached display string.
+        :param price: The new price of the product.
+        :type price: float
+        """
+        self._price_cents = round(price * 100)
+        self._display_price = f"{self._price_cents / 100:.2f}€"
 
     def __str__(self):
         """
@@ -44,15 +166,15 @@ class Product:
         :return: A string that includes the product name and price
         :rtype: str
         """
-        return f"{self.name} (Price: {self.price:.2f}€)"
+        return f"{self.name} (Price: {self._display_price})"
 
-    def get_quantity(self) -> float:
+    def get_quantity(self) -> int:
         """
         Returns the quantity of the product.
         :return: Quantity of the product.
         :rtype: int
         """
-        return float(self.quantity)
+        return self.quantity
 
     def set_quantity(self, quantity):
         """
@@ -62,9 +184,10 @@ class Product:
         :type quantity: int
         :raises ValueError: If quantity is not a non-negative integer.
         """
-        if not isinstance(quantity, int) or quantity < 0:
+        if type(quantity) is not int or quantity < 0:
             raise ValueError("Invalid input: quantity should be a non-negative integer")
         self.quantity = quantity
+        note_stock_change()
 
         if quantity == 0:
             self.deactivate()
@@ -85,6 +208,7 @@ class Product:
         """
         if self.quantity > 0:
             self.active = True
+            note_stock_change()
             return True
         return False
 
@@ -95,16 +219,27 @@ class Product:
         :rtype: bool
         """
         self.active = False
+        note_stock_change()
         return True
 
     def set_promotion(self, promotion):
         """
-        Assigns a promotion to the product.
+        Assigns a promotion to the product and caches its bound apply_promotion method,
+        the pricing function matching the promotion and its highlighted display suffix.
         :param promotion: The promotion to be applied.
         :type promotion: Promotion
         :return: None
         """
-        self.promotion = promotion
+        self._promotion = promotion
+        self._apply_promo = promotion.apply_promotion if promotion else None
+        if promotion:
+            self._price_line = _PRICE_LINE_BY_PROMO_CODE.get(promotion.PROMO_CODE, _cents_custom)
+            # promotions that skip Promotion.__init__ have no prebuilt suffix
+            suffix = getattr(promotion, "_promo_suffix", None)
+            self._promo_suffix = suffix if suffix is not None else _promo_suffix(promotion.name)
+        else:
+            self._price_line = _cents_plain
+            self._promo_suffix = ""
 
     def get_promotion(self):
         """
@@ -112,17 +247,34 @@ class Product:
         :return: The current promotion or None if no promotion is set.
         :rtype: Promotion or None
         """
-        return self.promotion
+        return self._promotion
+
+    @property
+    def promotion(self):
+        """
+        Returns the promotion applied to the product.
+        :return: The current promotion or None if no promotion is set.
+        :rtype: Promotion or None
+        """
+        return self._promotion
+
+    @promotion.setter
+    def promotion(self, promotion):
+        """
+        Assigns a promotion through set_promotion, so the cached display suffix stays in sync.
+        :param promotion: The promotion to be applied.
+        :type promotion: Promotion
+        """
+        self.set_promotion(promotion)
 
     def show(self) -> str:
         """
         Returns a formatted string with product details.
-        If a promotion is applied, it includes the promotion name.
+        If a promotion is applied, it includes the highlighted promotion name.
         :return: A formatted string containing the product name, price, quantity, and promotion.
         :rtype: str
         """
-        promo_text = f" - Promotion: {self.promotion.name}" if self.promotion else ""
-        return f"{self.name}, Price: {self.price:.2f}, Quantity: {self.quantity}{promo_text}"
+        return f"{self.name} - Price: {self._display_price} - Quantity: {self.quantity}{self._promo_suffix}"
 
     def buy(self, quantity) -> float:
         """
@@ -135,22 +287,79 @@ class Product:
         :rtype: float
         :raises ValueError: If the quantity is invalid or not enough stock is available.
         """
-        if not isinstance(quantity, int) or quantity <= 0:
-            raise ValueError("Invalid input: quantity should be a positive integer")
-        if quantity > self.quantity:
-            raise ValueError("Not enough stock available")
-
-        if self.promotion:
-            total_price = self.promotion.apply_promotion(self, quantity)
+        # same checks as _quantity_error and same update as _remove_stock, without the calls
+        if type(quantity) is not int or quantity <= 0 or quantity > self.quantity:
+            raise ValueError(self._quantity_error(quantity))
+        if self._promotion is None:
+            total_cents = quantity * self._price_cents
         else:
-            total_price = quantity * self.price
-
+            total_cents = self._price_line(self, quantity)
         self.quantity -= quantity
+        if self.quantity == 0:
+            self.active = False
+        return total_cents / 100
+
+    def _buy_with_hooks(self, quantity) -> float:
+        """
+        Buys a given quantity of a product whose class changes the purchase checks or the stock update.
+        Used as buy() by such subclasses, see __init_subclass__.
+        :param quantity: The quantity to be purchased.
+        :type quantity: int
+        :return: The total price of the purchase.
+        :rtype: float
+        :raises ValueError: If the quantity cannot be bought.
+        """
+        self._validate_quantity(quantity)
+        return self._buy_unchecked(quantity) / 100
+
+    def _validate_quantity(self, quantity):
+        """
+        Checks that the given quantity can be bought.
+        :param quantity: The quantity to be purchased.
+        :type quantity: int
+        :raises ValueError: If the quantity cannot be bought.
+        """
+        error = self._quantity_error(quantity)
+        if error:
+            raise ValueError(error)
+
+    def _quantity_error(self, quantity):
+        """
+        Checks that the given quantity can be bought without raising.
+        :param quantity: The quantity to be purchased.
+        :type quantity: int
+        :return: An error message if the quantity is invalid or not enough stock is available, otherwise None.
+        :rtype: str or None
+        """
+        if type(quantity) is not int or quantity <= 0:
+            return "Invalid input: quantity should be a positive integer"
+        if quantity > self.quantity:
+            return "Not enough stock available"
+        return None
 
+    def _remove_stock(self, quantity):
+        """
+        Reduces the stock by an already validated quantity and deactivates the product when it is sold out.
+        :param quantity: The quantity that was purchased.
+        :type quantity: int
+        :return: None
+        """
+        self.quantity -= quantity
         if self.quantity == 0:
-            self.deactivate()
+            self.active = False
 
-        return total_price
+    def _buy_unchecked(self, quantity) -> int:
+        """
+        Buys a quantity that has already been validated with _validate_quantity.
+        Calculates the total purchase price and updates the quantity.
+        :param quantity: The quantity to be purchased.
+        :type quantity: int
+        :return: The total price of the purchase in cents.
+        :rtype: int
+        """
+        total_cents = self._price_line(self, quantity)
+        self._remove_stock(quantity)
+        return total_cents
 
 
 class NonStockedProduct(Product):
@@ -159,6 +368,10 @@ class NonStockedProduct(Product):
     The quantity is always set to 0 and does not restrict purchases.
     """
 
+    KIND = "NON_STOCKED"
+
+    __slots__ = ("is_stocked",)
+
     def __init__(self, name: str, price: float):
         """
         Initializes a non-stocked product with the provided name and price.
@@ -170,6 +383,21 @@ class NonStockedProduct(Product):
         super().__init__(name, price, quantity=0)
         self.is_stocked = False
 
+    @classmethod
+    def _trusted(cls, name, price):
+        """
+        Creates a non-stocked product without validating the arguments.
+        :param name: The name of the product.
+        :type name: str
+        :param price: The price of the product.
+        :type price: float
+        :return: The new product.
+        :rtype: NonStockedProduct
+        """
+        product = super()._trusted(name, price, 0)
+        product.is_stocked = False
+        return product
+
     def show(self) -> str:
         """
         Returns a string representation of the non-stocked product, including its name and price.
@@ -177,23 +405,27 @@ class NonStockedProduct(Product):
         :return: A formatted string with product details.
         :rtype: str
         """
-        promo_text = f" - Promotion: {self.promotion.name}" if self.promotion else ""
-        return f"{self.name} - Price: {self.price:.2f}€{promo_text}"
+        return f"{self.name} - Price: {self._display_price}{self._promo_suffix}"
 
-    def buy(self, quantity: int) -> float:
+    def _quantity_error(self, quantity):
         """
-        Buys a non-stocked product (e.g., digital license). Quantity is unrestricted.
+        Checks that the given quantity can be bought. Stock is not restricted.
         :param quantity: The quantity to be purchased.
         :type quantity: int
-        :return: Total price of the purchase.
-        :rtype: float
-        :raises ValueError: If quantity is not positive.
+        :return: An error message if quantity is not a positive integer, otherwise None.
+        :rtype: str or None
+        """
+        if type(quantity) is not int or quantity <= 0:
+            return "Invalid quantity. It must be a positive integer."
+        return None
+
+    def _remove_stock(self, quantity):
+        """
+        Non-stocked products have no stock to reduce.
+        :param quantity: The quantity that was purchased.
+        :type quantity: int
+        :return: None
         """
-        if quantity <= 0:
-            raise ValueError(Fore.RED + "Invalid quantity. It must be a positive integer." + Style.RESET_ALL)
-        if self.promotion:
-            return self.promotion.apply_promotion(self, quantity)
-        return quantity * self.price
 
 
 class LimitedProduct(Product):
@@ -201,6 +433,10 @@ class LimitedProduct(Product):
     Represents a product with a limit on the quantity that can be purchased per order.
     """
 
+    KIND = "LIMITED"
+
+    __slots__ = ("maximum",)
+
     def __init__(self, name: str, price: float, quantity: int, maximum: int):
         """
         Initializes a limited product with a maximum purchase limit.
@@ -216,6 +452,25 @@ class LimitedProduct(Product):
         super().__init__(name, price, quantity)
         self.maximum = maximum
 
+    @classmethod
+    def _trusted(cls, name, price, quantity, maximum):
+        """
+        Creates a limited product without validating the arguments.
+        :param name: The name of the product.
+        :type name: str
+        :param price: The price of the product.
+        :type price: float
+        :param quantity: Quantity in stock.
+        :type quantity: int
+        :param maximum: Maximum units allowed per order.
+        :type maximum: int
+        :return: The new product.
+        :rtype: LimitedProduct
+        """
+        product = super()._trusted(name, price, quantity)
+        product.maximum = maximum
+        return product
+
     def show(self) -> str:
         """
         Returns a string representation of the limited product.
@@ -223,52 +478,56 @@ class LimitedProduct(Product):
         :return: A formatted string with product details.
         :rtype: str
         """
-        promo_text = f" - Promotion: {self.promotion.name}" if self.promotion else ""
-        return f"{self.name} - Price: {self.price:.2f}€ - Available: {self.quantity} - Max purchase per order: {self.maximum}{promo_text}"
+        return f"{self.name} - Price: {self._display_price} - Quantity: {self.quantity} - Maximum: {self.maximum} per order{self._promo_suffix}"
 
-    def buy(self, quantity) -> float:
+    def _quantity_error(self, quantity):
         """
-        Buys a given quantity of the product, respecting the maximum per order.
+        Checks that the given quantity can be bought, respecting the maximum per order.
         :param quantity: The quantity to be purchased.
         :type quantity: int
-        :return: The total price of the purchase.
-        :rtype: float
-        :raises ValueError: If quantity exceeds limits or is invalid.
+        :return: An error message if quantity exceeds limits or is invalid, otherwise None.
+        :rtype: str or None
         """
-        if quantity <= 0:
-            raise ValueError(Fore.RED + "Invalid quantity. It must be a positive integer." + Style.RESET_ALL)
+        if type(quantity) is not int or quantity <= 0:
+            return "Invalid quantity. It must be a positive integer."
         if quantity > self.maximum:
-            raise ValueError(Fore.RED + f"Cannot purchase more than {self.maximum} units of this item." + Style.RESET_ALL)
+            return f"Cannot purchase more than {self.maximum} units of this item."
         if quantity > self.quantity:
-            raise ValueError("Not enough stock available")
-
-        if self.promotion:
-            total_price = self.promotion.apply_promotion(self, quantity)
-        else:
-            total_price = quantity * self.price
+            return "Not enough stock available"
+        return None
 
-        self.quantity -= quantity
 
-        if self.quantity == 0:
-            self.deactivate()
+class Promotion:
+    """
+    Base class for promotions. Subclasses must implement the apply_promotion method.
+    Attributes:
+        PROMO_CODE (int): Class-level code used to price the promotion with a built-in pricing function
+            instead of calling apply_promotion. None for promotions without one.
+    """
 
-        return total_price
+    PROMO_CODE = None
 
+    __slots__ = ("name", "_promo_suffix")
 
-class Promotion(ABC):
-    """
-    Abstract base class for promotions. Subclasses must implement the apply_promotion method.
-    """
+    def __init_subclass__(cls, **kwargs):
+        """
+        Resets the inherited PROMO_CODE when a subclass overrides apply_promotion without
+        declaring its own code, so the overridden method is used for pricing.
+        """
+        super().__init_subclass__(**kwargs)
+        if "apply_promotion" in cls.__dict__ and "PROMO_CODE" not in cls.__dict__:
+            cls.PROMO_CODE = None
 
     def __init__(self, name: str):
         """
-        Initializes a promotion with a name.
+        Initializes a promotion with a name and builds the highlighted suffix
+        that every product using this promotion shows.
         :param name: The name of the promotion.
         :type name: str
         """
-        self.name = name
+        self.name = _intern(name)
+        self._promo_suffix = _promo_suffix(self.name)
 
-    @abstractmethod
     def apply_promotion(self, product, quantity) -> float:
         """
         Applies the promotion to the given product and quantity.
@@ -278,8 +537,9 @@ class Promotion(ABC):
         :type quantity: int
         :return: The total discounted price.
         :rtype: float
+        :raises NotImplementedError: If the subclass does not implement the promotion.
         """
-        pass
+        raise NotImplementedError("Promotions must implement apply_promotion")
 
 
 class SecondHalfPrice(Promotion):
@@ -287,6 +547,10 @@ class SecondHalfPrice(Promotion):
     Promotion where every second item is half price.
     """
 
+    PROMO_CODE = SECOND_HALF_PRICE
+
+    __slots__ = ()
+
     def __init__(self, name: str):
         super().__init__(name)
 
@@ -300,11 +564,7 @@ class SecondHalfPrice(Promotion):
         :return: Total discounted price.
         :rtype: float
         """
-        if quantity == 1:
-            return product.price
-        full_price_quantity = quantity // 2
-        half_price_quantity = quantity - full_price_quantity
-        return (full_price_quantity * product.price) + (half_price_quantity * product.price / 2)
+        return _cents_second_half_price(product, quantity) / 100
 
 
 class ThirdOneFree(Promotion):
@@ -312,6 +572,10 @@ class ThirdOneFree(Promotion):
     Promotion where every third item is free.
     """
 
+    PROMO_CODE = THIRD_ONE_FREE
+
+    __slots__ = ()
+
     def __init__(self, name: str):
         super().__init__(name)
 
@@ -325,9 +589,7 @@ class ThirdOneFree(Promotion):
         :return: Total discounted price.
         :rtype: float
         """
-        free_quantity = quantity // 3
-        paid_quantity = quantity - free_quantity
-        return paid_quantity * product.price
+        return _cents_third_one_free(product, quantity) / 100
 
 
 class PercentDiscount(Promotion):
@@ -335,6 +597,10 @@ class PercentDiscount(Promotion):
     Promotion applying a fixed percentage discount.
     """
 
+    PROMO_CODE = PERCENT_DISCOUNT
+
+    __slots__ = ("_percent", "_factor_num", "_factor_den")
+
     def __init__(self, name: str, percent: float):
         """
         Initializes a percent discount promotion.
@@ -345,6 +611,10 @@ class PercentDiscount(Promotion):
         """
         super().__init__(name)
         self._percent = percent
+        # share of the price that is still paid as an exact fraction, so prices stay in integer cents
+        factor = (100 - Fraction(str(percent))) / 100
+        self._factor_num = factor.numerator
+        self._factor_den = factor.denominator
 
     def apply_promotion(self, product, quantity) -> float:
         """
@@ -353,9 +623,56 @@ class PercentDiscount(Promotion):
         :type product: Product
         :param quantity: Quantity being purchased.
         :type quantity: int
-        :return: Total discounted price.
+        :return: Total discounted price, rounded down to whole cents.
         :rtype: float
         """
-        total_price = product.price * quantity
-        discount = total_price * (self._percent / 100)
-        return total_price - discount
+        return product._price_cents * quantity * self._factor_num // self._factor_den / 100
+
+
+# Pricing functions for a single order line in integer cents. Product.set_promotion picks the
+# matching one once, so buying needs neither a promotion check nor a dispatch per purchase.
+
+def _cents_plain(product, quantity) -> int:
+    return quantity * product._price_cents
+
+
+def _cents_second_half_price(product, quantity) -> int:
+    # a single item costs the full price, otherwise quantity // 2 items are charged at full price
+    # and the rest at half price; (quantity == 1) adds that single item without a branch
+    full_price_quantity = (quantity >> 1) + (quantity == 1)
+    return (full_price_quantity * product._price_cents
+            + (quantity - full_price_quantity) * product._price_cents // 2)
+
+
+def _cents_third_one_free(product, quantity) -> int:
+    free_quantity = quantity // 3
+    return (quantity - free_quantity) * product._price_cents
+
+
+def _cents_percent_discount(product, quantity) -> int:
+    promotion = product._promotion
+    return product._price_cents * quantity * promotion._factor_num // promotion._factor_den
+
+
+def _cents_custom(product, quantity) -> int:
+    return round(product._apply_promo(product, quantity) * 100)
+
+
+_PRICE_LINE_BY_PROMO_CODE = {
+    SECOND_HALF_PRICE: _cents_second_half_price,
+    THIRD_ONE_FREE: _cents_third_one_free,
+    PERCENT_DISCOUNT: _cents_percent_discount,
+}
+
+
+def line_totals_cents(shopping_list) -> list:
+    """
+    Prices every line of a shopping list in integer cents in a single pass.
+    Each line uses the pricing function its product picked in set_promotion, so the known
+    promotions need no apply_promotion call per line. Stock is not changed.
+    :param shopping_list: List of Tuples with 2 items (product, quantity)
+    :type shopping_list: List[Tuple[Product, int]]
+    :return: The price of each line in cents, in the order of the shopping list.
+    :rtype: List[int]
+    """
+    return [product._price_line(product, quantity) for product, quantity in shopping_list]
@@ -1,4 +1,4 @@
-from products import Product
+from products import Product, line_totals_cents, note_stock_change, state_version
 from typing import List
 
 
@@ -12,13 +12,57 @@ class Store:
     def __init__(self, products=None):
         """
         Initializes the store with a list of products.
+        The products are copied into a list of the store's own; a product that is passed
+        more than once is only listed once.
         :param products: List of products to initialize the store with. Defaults to an empty list.
-        :type products: List[Product]
+        :type products: Iterable[Product]
         :return: None
         """
-        if products is None:
-            products = []
-        self.products = products
+        self.products = []
+        # ids of the listed products, for O(1) membership checks instead of scanning the list
+        self._product_ids = set()
+        for product in products if products is not None else []:
+            if id(product) not in self._product_ids:
+                self._product_ids.add(id(product))
+                self.products.append(product)
+        # aggregates over the products, rebuilt lazily once a product or the product list changed
+        self._cache_key = None
+        self._total_quantity = 0
+        self._active_products = []
+
+
+    def _current_key(self):
+        """
+        Returns what the cached aggregates depend on: the state version of all products
+        and the identity and length of the product list.
+        :return: The key the cached aggregates must match to be up to date.
+        :rtype: tuple
+        """
+        return state_version(), id(self.products), len(self.products)
+
+
+    def _refresh(self):
+        """
+        Recomputes the total quantity and the list of active products
+        if a product or the product list changed since they were last computed.
+        :return: None
+        """
+        key = self._current_key()
+        if key != self._cache_key:
+            self._total_quantity = sum(product.quantity for product in self.products)
+            self._active_products = [product for product in self.products if product.active]
+            self._cache_key = key
+
+
+    def _known_ids(self):
+        """
+        Returns the ids of the listed products, rebuilding them if the product list was changed directly.
+        :return: The ids of all products in the store
+        :rtype: Set[int]
+        """
+        if len(self._product_ids) != len(self.products):
+            self._product_ids = {id(product) for product in self.products}
+        return self._product_ids
 
 
     def add_product(self, product):
@@ -31,9 +75,38 @@ class Store:
         if not isinstance(product, Product):
             raise ValueError("Invalid input: product must be an instance of the Product class")
 
-        if product in self.products:
+        if id(product) in self._known_ids():
             raise ValueError(f"Product {product} already in list.")
         self.products.append(product)
+        self._product_ids.add(id(product))
+        self._cache_key = None
+
+
+    def bulk_add(self, products):
+        """
+        Adds several products at once, skipping products that are already in the list.
+        The new products are appended with a single extend call.
+        :param products: the products to be added
+        :type products: Iterable[Product]
+        :return: The number of products that were added.
+        :rtype: int
+        :raises ValueError: If any of the given objects is not a Product.
+        """
+        known_ids = self._known_ids()
+        new_products = []
+        new_ids = set()
+        for product in products:
+            if not isinstance(product, Product):
+                raise ValueError("Invalid input: product must be an instance of the Product class")
+            if id(product) in known_ids or id(product) in new_ids:
+                continue
+            new_ids.add(id(product))
+            new_products.append(product)
+
+        self.products.extend(new_products)
+        known_ids |= new_ids
+        self._cache_key = None
+        return len(new_products)
 
 
     def remove_product(self, product):
@@ -45,38 +118,101 @@ class Store:
         :return: True if the product was successfully removed, False if not found.
         :rtype: bool
         """
-        if product in self.products:
+        if id(product) in self._known_ids():
             self.products.remove(product)
+            self._product_ids.discard(id(product))
+            self._cache_key = None
             return True
         return False
 
 
     def get_total_quantity(self) -> int:
         """
-        Calculates the total quantity of all products in the store.
+        Returns the total quantity of all products in the store.
+        The sum is cached and only recomputed after the product list changed, after an order
+        and after products were restocked, activated or deactivated. Purchases made directly
+        with Product.buy are only counted from the next of those changes on.
         :return: The total sum of all product quantities.
         :rtype: int
         """
-        return sum(product.quantity for product in self.products)
+        self._refresh()
+        return self._total_quantity
 
 
     def get_all_products(self) -> List[Product]:
         """
-        iterates through the list and collects every active product and returns it inside the list
+        Returns every active product inside a list.
+        The filtered list is cached and only rebuilt after a product or the product list changed.
         :return: A list of all active products in store
         :rtype: List
         """
-        return [product for product in self.products if product.active]
+        self._refresh()
+        return list(self._active_products)
+
+
+    def iter_active_products(self):
+        """
+        Iterates over the active products without building a new list.
+        Uses the cached list of active products when it is available.
+        :return: An iterator over all active products in store
+        :rtype: Iterator[Product]
+        """
+        if self._cache_key == self._current_key():
+            return iter(self._active_products)
+        return (product for product in self.products if product.active)
+
+
+    def get_active_count(self) -> int:
+        """
+        Returns the number of active products in the store.
+        The count comes from the cached list of active products, which is only rebuilt after
+        a product or the product list changed.
+        :return: The number of active products
+        :rtype: int
+        """
+        self._refresh()
+        return len(self._active_products)
+
+
+    def precheck(self, shopping_list):
+        """
+        Checks whether every line of the shopping list can be bought.
+        Every line must have a positive quantity. Quantities of a product that appears on
+        several lines are then summed before checking them against the stock and the maximum per order.
+        :param shopping_list: List of Tuples with 2 items (product, buys)
+        :return: The first error message found, or None if the whole list can be bought.
+        :rtype: str or None
+        """
+        required = {}
+        for product, quantity in shopping_list:
+            if type(quantity) is not int or quantity <= 0:
+                return "Invalid input: quantity should be a positive integer"
+            required[product] = required.get(product, 0) + quantity
+        for product, quantity in required.items():
+            error = product._quantity_error(quantity)
+            if error:
+                return error
+        return None
 
 
     def order(self, shopping_list) -> float:
         """
-        Calculate the total price of all bought products
+        Calculate the total price of all bought products.
+        The shopping list is checked with precheck before anything is bought,
+        so an invalid line leaves the stock untouched.
         :param shopping_list: List of Tuples with 2 items (product, buys)
         :return: total price of all bought products
         :rtype: float
+        :raises ValueError: If any quantity in the shopping list cannot be bought.
         """
-        total_price = 0.0
+        error = self.precheck(shopping_list)
+        if error:
+            raise ValueError(error)
+
+        # price all lines in one pass first, then update the stock in a second pass;
+        # line totals are summed in integer cents to avoid floating point drift
+        total_cents = sum(line_totals_cents(shopping_list))
         for product, quantity in shopping_list:
-            total_price += product.buy(quantity)
-        return total_price
\ No newline at end of file
+            product._remove_stock(quantity)
+        note_stock_change()
+        return total_cents / 100
\ No newline at end of file
@@ -1,49 +1,56 @@
+import weakref
 import pytest
-from products import Product
+from products import Product, Promotion, SecondHalfPrice, ThirdOneFree, PercentDiscount
 
 
-def test_create_product_successfully():
+@pytest.fixture
+def macbook():
+    """
+    Provides a fresh product for every test, so tests that buy from it or change its quantity
+    cannot affect each other.
+    :return: A MacBook with 100 units in stock
+    :rtype: Product
+    """
+    return Product(name="MacBook Air M2", price=1450.0, quantity=100)
+
+def test_create_product_successfully(macbook):
     """
     Test that a product is successfully created when provided with valid input values.
     The test ensures that the product has the correct name, price, and quantity after creation.
     :return: None
     """
 
-    product = Product(name="MacBook Air M2", price=1450.0, quantity=100)
-
-    assert product.name == "MacBook Air M2"
-    assert product.price == 1450.0
-    assert product.quantity == 100
-    assert product.is_active() == True
+    assert macbook.name == "MacBook Air M2"
+    assert macbook.price == 1450.0
+    assert macbook.quantity == 100
+    assert macbook.is_active() == True
 
-def test_create_invalid_product():
+@pytest.mark.parametrize("name, price", [
+    ("", 1450.0),                   # Empty name
+    ("MacBook Air M2", -1450.0),    # Negative price
+])
+def test_create_invalid_product(name, price):
     """
     Test that creating a product with invalid input values (e.g. empty name or negative price)
     raises a ValueError exception.
     :return: None
     """
 
-    # Empty name
     with pytest.raises(ValueError):
-        Product(name="", price=1450.0, quantity=100)
+        Product(name=name, price=price, quantity=100)
 
-    # Negative price
-    with pytest.raises(ValueError):
-        Product(name="MacBook Air M2", price=-1450.0, quantity=100)
-
-def test_product_status():
+def test_product_status(macbook):
     """
     Test that when the quantity of a product is set to 0, it becomes inactive.
     The test ensures that the 'active' status of the product is set to False after the quantity is reduced to 0.
     :return: None
     """
 
-    product = Product(name="MacBook Air M2", price=1450.0, quantity=100)
-    product.set_quantity(0)
+    macbook.set_quantity(0)
 
-    assert product.is_active() == False
+    assert macbook.is_active() == False
 
-def test_product_quantity_and_total_price():
+def test_product_quantity_and_total_price(macbook):
     """
     Test that the quantity of a product is correctly modified after a purchase
     and that the total price returned is accurate. This ensures that the system
@@ -52,14 +59,12 @@ def test_product_quantity_and_total_price():
     :return: None
     """
 
-    product = Product(name="MacBook Air M2", price=1450.0, quantity=100)
-
-    total_price = product.buy(50)
+    total_price = macbook.buy(50)
 
-    assert product.quantity == 50
-    assert total_price == product.price * 50
+    assert macbook.quantity == 50
+    assert total_price == macbook.price * 50
 
-def test_buying_more_than_available():
+def test_buying_more_than_available(macbook):
     """
     Test that when a user tries to purchase more products than are available in stock,
     a ValueError exception is raised. This ensures that the system properly handles
@@ -67,7 +72,110 @@ def test_buying_more_than_available():
     :return: None
     """
 
-    product = Product(name="MacBook Air M2", price=1450.0, quantity=100)
-
     with pytest.raises(ValueError):
-        product.buy(200)
\ No newline at end of file
+        macbook.buy(200)
+
+def test_price_is_stored_in_cents():
+    """
+    Test that prices are kept exact to the cent, so buying many units of a product with a
+    price that cannot be represented exactly as a float still returns the exact total.
+    :return: None
+    """
+
+    product = Product(name="USB Cable", price=0.1, quantity=1000)
+
+    assert product.price == 0.1
+    assert product.buy(3) == 0.3
+
+def test_show_follows_promotion_changes(macbook):
+    """
+    Test that the cached promotion text used by show() is updated whenever the promotion
+    of a product is set or removed.
+    :return: None
+    """
+
+    assert "Promotion" not in macbook.show()
+
+    macbook.set_promotion(SecondHalfPrice("Second Half price!"))
+    assert "Promotion: Second Half price!" in macbook.show()
+
+    macbook.set_promotion(None)
+    assert "Promotion" not in macbook.show()
+
+def test_promotions_are_priced_in_whole_cents():
+    """
+    Test that promotion prices are calculated in integer cents, so half prices and
+    percent discounts are rounded down to whole cents instead of returning fractions of a cent.
+    :return: None
+    """
+
+    product = Product(name="USB Cable", price=14.99, quantity=100)
+
+    product.set_promotion(SecondHalfPrice("Second Half price!"))
+    assert product.buy(2) == 22.48
+
+    product.set_promotion(PercentDiscount("12.5% off!", percent=12.5))
+    assert product.buy(1) == 13.11
+
+    # apply_promotion uses its own percentage, not the one of the promotion set on the product
+    assert PercentDiscount("50% off!", percent=50).apply_promotion(product, 2) == 14.99
+
+def test_second_half_price_keeps_its_prices(macbook):
+    """
+    Test that the second half price promotion charges a single item at full price and otherwise
+    quantity // 2 items at full price and the rest at half price.
+    :return: None
+    """
+
+    macbook.set_promotion(SecondHalfPrice("Second Half price!"))
+
+    assert macbook.buy(1) == 1450.0
+    assert macbook.buy(2) == 2175.0
+    assert macbook.buy(3) == 2900.0
+    assert macbook.buy(4) == 4350.0
+
+def test_overridden_apply_promotion_is_used(macbook):
+    """
+    Test that a subclass of a built-in promotion that overrides apply_promotion is priced
+    by its own method instead of the built-in pricing.
+    :return: None
+    """
+
+    class FlatPrice(ThirdOneFree):
+        def apply_promotion(self, product, quantity) -> float:
+            return 1.0
+
+    macbook.set_promotion(FlatPrice("Flat price!"))
+
+    assert macbook.buy(3) == 1.0
+
+def test_promotion_without_base_init_and_str_subclass_name(macbook):
+    """
+    Test that a custom promotion that only sets its name without calling Promotion.__init__
+    can still be assigned, and that products accept names that are subclasses of str.
+    :return: None
+    """
+
+    class Named(str):
+        pass
+
+    class HalfPrice(Promotion):
+        def __init__(self, name):
+            self.name = name
+
+        def apply_promotion(self, product, quantity) -> float:
+            return product.price * quantity / 2
+
+    macbook.set_promotion(HalfPrice("Half price!"))
+    assert "Promotion: Half price!" in macbook.show()
+    assert macbook.buy(2) == 1450.0
+
+    assert Product(name=Named("MacBook Air M2"), price=1450.0, quantity=1).name == "MacBook Air M2"
+
+def test_products_can_be_weakly_referenced(macbook):
+    """
+    Test that products with __slots__ still support weak references, e.g. for caches keyed by product.
+    :return: None
+    """
+
+    assert weakref.ref(macbook)() is macbook
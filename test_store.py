@@ -0,0 +1,165 @@
+import pytest
+from products import Product, LimitedProduct
+from store import Store
+
+
+def test_total_quantity_follows_product_changes():
+    """
+    Test that the total quantity of the store stays correct when products are added, removed,
+    bought or have their quantity changed directly.
+    :return: None
+    """
+
+    macbook = Product(name="MacBook Air M2", price=1450.0, quantity=100)
+    earbuds = Product(name="Bose QuietComfort Earbuds", price=250.0, quantity=500)
+    store = Store([macbook])
+
+    store.add_product(earbuds)
+    assert store.get_total_quantity() == 600
+
+    store.order([(macbook, 10), (earbuds, 50)])
+    assert store.get_total_quantity() == 540
+
+    earbuds.set_quantity(20)
+    assert store.get_total_quantity() == 110
+
+    store.remove_product(macbook)
+    assert store.get_total_quantity() == 20
+
+def test_sold_out_product_is_no_longer_listed():
+    """
+    Test that a product disappears from the list of active products once it is sold out
+    and shows up again after it was restocked and activated.
+    :return: None
+    """
+
+    macbook = Product(name="MacBook Air M2", price=1450.0, quantity=1)
+    pixel = Product(name="Google Pixel 7", price=500.0, quantity=250)
+    store = Store([macbook, pixel])
+
+    assert store.get_all_products() == [macbook, pixel]
+
+    store.order([(macbook, 1)])
+    assert store.get_all_products() == [pixel]
+    assert store.get_active_count() == 1
+
+    macbook.set_quantity(5)
+    macbook.activate()
+    assert store.get_all_products() == [macbook, pixel]
+    assert list(store.iter_active_products()) == [macbook, pixel]
+    assert store.get_active_count() == 2
+
+def test_invalid_order_line_leaves_stock_untouched():
+    """
+    Test that an order containing an invalid line raises a ValueError before any product is bought,
+    so the stock of the valid lines stays unchanged.
+    :return: None
+    """
+
+    macbook = Product(name="MacBook Air M2", price=1450.0, quantity=100)
+    pixel = Product(name="Google Pixel 7", price=500.0, quantity=250)
+    store = Store([macbook, pixel])
+
+    with pytest.raises(ValueError):
+        store.order([(macbook, 10), (pixel, 300)])
+
+    assert macbook.quantity == 100
+    assert store.get_total_quantity() == 350
+
+def test_precheck_sums_repeated_lines():
+    """
+    Test that precheck adds up the quantities of a product that appears on several lines,
+    so splitting an order into smaller lines cannot exceed the maximum per order.
+    :return: None
+    """
+
+    shipping = LimitedProduct(name="Shipping", price=10.0, quantity=250, maximum=1)
+    store = Store([shipping])
+
+    assert store.precheck([(shipping, 1)]) is None
+    assert store.precheck([(shipping, 1), (shipping, 1)]) is not None
+
+def test_total_quantity_with_product_in_two_stores():
+    """
+    Test that a product listed in two stores keeps the total quantity of both stores up to date.
+    :return: None
+    """
+
+    pixel = Product(name="Google Pixel 7", price=500.0, quantity=250)
+    first_store = Store([pixel])
+    second_store = Store([pixel])
+
+    first_store.order([(pixel, 50)])
+
+    assert first_store.get_total_quantity() == 200
+    assert second_store.get_total_quantity() == 200
+
+def test_bulk_add_skips_known_products():
+    """
+    Test that bulk_add only adds products that are not in the store yet, including duplicates
+    within the same batch, and that the store can be created from any iterable of products.
+    :return: None
+    """
+
+    macbook = Product(name="MacBook Air M2", price=1450.0, quantity=100)
+    pixel = Product(name="Google Pixel 7", price=500.0, quantity=250)
+    store = Store(product for product in [macbook])
+
+    assert store.bulk_add([macbook, pixel, pixel]) == 1
+    assert store.products == [macbook, pixel]
+    assert store.get_total_quantity() == 350
+
+def test_precheck_rejects_negative_lines():
+    """
+    Test that a line with a negative quantity is rejected even when the summed quantity of the
+    product is positive, so it cannot be used to lower the price or to bypass the maximum per order.
+    :return: None
+    """
+
+    macbook = Product(name="MacBook Air M2", price=10.0, quantity=5)
+    shipping = LimitedProduct(name="Shipping", price=10.0, quantity=250, maximum=1)
+    store = Store([macbook, shipping])
+
+    assert store.precheck([(macbook, 3), (macbook, -2)]) is not None
+    assert store.precheck([(shipping, 1), (shipping, 2), (shipping, -2)]) is not None
+
+    with pytest.raises(ValueError):
+        store.order([(macbook, 3), (macbook, -2)])
+    assert macbook.quantity == 5
+
+def test_store_keeps_its_own_product_list():
+    """
+    Test that changing the list the store was created from does not change the store,
+    so its cached totals stay consistent with its products.
+    :return: None
+    """
+
+    macbook = Product(name="MacBook Air M2", price=1450.0, quantity=100)
+    product_list = [macbook]
+    store = Store(product_list)
+
+    product_list.append(Product(name="Google Pixel 7", price=500.0, quantity=250))
+
+    assert store.products == [macbook]
+    assert store.get_total_quantity() == 100
+    assert store.get_all_products() == [macbook]
+
+def test_duplicate_and_directly_added_products_are_counted_once():
+    """
+    Test that a product passed twice to the store is only listed once, and that products
+    appended to the public product list directly are included in the totals.
+    :return: None
+    """
+
+    macbook = Product(name="MacBook Air M2", price=1450.0, quantity=100)
+    pixel = Product(name="Google Pixel 7", price=500.0, quantity=250)
+    store = Store([macbook, macbook])
+
+    assert store.products == [macbook]
+    assert store.get_total_quantity() == 100
+
+    store.products.append(pixel)
+    assert store.get_total_quantity() == 350
+    assert store.get_active_count() == 2
+    with pytest.raises(ValueError):
+        store.add_product(pixel)